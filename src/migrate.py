@@ -2,17 +2,48 @@ import os
 import sys
 import re
 import time
-import boto3
+import heapq
 import logging
 import argparse
 import importlib.util
+from dataclasses import dataclass
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 
 log_format = '%(levelname)s:%(name)s:%(funcName)s: %(message)s'
-logging.basicConfig(level=logging.DEBUG, format=log_format)
-logging.getLogger('botocore').setLevel(logging.CRITICAL + 1)
-logging.getLogger('boto3').setLevel(logging.CRITICAL + 1)
-logging.getLogger('urllib3').setLevel(logging.CRITICAL + 1)
+logger = logging.getLogger('migrate')
+
+_MIGRATION_RE = re.compile(r'\d{14}_.*\.py$')
+
+# Compiled migration code, keyed on (path, mtime, size) so edited files are recompiled.
+_CODE_CACHE = {}
+
+
+def _get_code(spec):
+    """
+        Return the code object for a migration module spec, compiling it at most once per
+        version of the file.
+    """
+
+    stat = os.stat(spec.origin)
+    key = (spec.origin, stat.st_mtime_ns, stat.st_size)
+    code = _CODE_CACHE.get(key)
+    if code is None:
+        code = spec.loader.get_code(spec.name)
+        _CODE_CACHE[key] = code
+
+    return code
+
+
+@dataclass(slots=True, frozen=True)
+class MigrationFile:
+    """
+        A migration file found on disk: its name without the .py extension and its full path.
+    """
+
+    name: str
+    path: str
 
 
 class DynamoDBStorageEngine:
@@ -20,57 +51,155 @@ class DynamoDBStorageEngine:
         A storage engine that uses DynamoDB to store the state of the migrations.
     """
 
-    _table_exists = None
-
     def __init__(self, table_name, endpoint_url=None):
         self.table_name = table_name
         self.endpoint_url = endpoint_url
+        self._resource = None
+        self._client = None
+        self._table = None
+        self._ran = None
+        self._batch = None
+        self._ready = None
+
+    def __enter__(self):
+        """
+            Buffer store() and delete() calls into BatchWriteItem requests until the
+            context exits.
+        """
+
+        self._batch = self._get_table().batch_writer()
+        self._batch.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        batch, self._batch = self._batch, None
+        return batch.__exit__(exc_type, exc_value, traceback)
+
+    def _get_resource(self):
+        """
+            Build the DynamoDB resource once and reuse it, along with its connection pool,
+            for every subsequent call.
+        """
+
+        if self._resource is None:
+            # boto3 and botocore are slow to import, so only pay for them when DynamoDB is
+            # actually used
+            import boto3
+            from botocore.config import Config
+
+            # Keep a warm, pooled connection across every call instead of paying for a new
+            # TLS handshake per operation.
+            config = Config(
+                max_pool_connections=25,
+                tcp_keepalive=True,
+                retries={'mode': 'adaptive', 'max_attempts': 10},
+                connect_timeout=3,
+                read_timeout=10
+            )
+            # A private session, since prepare() builds these on a background thread while
+            # migration scripts may be using boto3's default session, which is not thread-safe
+            session = boto3.session.Session()
+            self._resource = session.resource('dynamodb', endpoint_url=self.endpoint_url, config=config)
+            # A plain client, unlike resource.meta.client, returns raw attribute maps without
+            # running them through boto3's type deserializer
+            self._client = session.client('dynamodb', endpoint_url=self.endpoint_url, config=config)
+
+        return self._resource
+
+    def prepare(self):
+        """
+            Start checking for (and if needed creating) the table in the background, so the
+            caller can load migration scripts while DynamoDB provisions it.
+        """
+
+        if self._table is None and self._ready is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+            self._ready = executor.submit(self._ensure_table)
+            executor.shutdown(wait=False)
 
     def _get_table(self):
-        dynamodb = boto3.resource('dynamodb', endpoint_url=self.endpoint_url)
+        if self._table is None:
+            if self._ready is not None:
+                self._ready.result()
+            else:
+                self._ensure_table()
+
+        return self._table
+
+    def _ensure_table(self):
+        resource = self._get_resource()
+
         # Make table if non-existant
-        if not self._table_exists:
-            table_names = [table.name for table in dynamodb.tables.all()]
-            if self.table_name not in table_names:
-                logging.debug(f"Creating table {self.table_name}")
-                table = dynamodb.create_table(
-                    TableName=self.table_name,
-                    KeySchema=[{'AttributeName': 'filename', 'KeyType': 'HASH'}],
-                    AttributeDefinitions=[{'AttributeName': 'filename', 'AttributeType': 'S'}],
-                    ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
-                )
-
-                logging.debug(f"Waiting for table {self.table_name} to be created")
-                table.wait_until_exists()
-
-                logging.debug(f"Table {self.table_name} created")
-
-        self._table_exists = True
-        table = dynamodb.Table(self.table_name)
-        return table
+        try:
+            self._client.describe_table(TableName=self.table_name)
+        except self._client.exceptions.ResourceNotFoundException:
+            logger.debug("Creating table %s", self.table_name)
+            self._client.create_table(
+                TableName=self.table_name,
+                KeySchema=[{'AttributeName': 'filename', 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': 'filename', 'AttributeType': 'S'}],
+                ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+            )
+
+            logger.debug("Waiting for table %s to be created", self.table_name)
+            self._client.get_waiter('table_exists').wait(TableName=self.table_name)
+
+            logger.debug("Table %s created", self.table_name)
+
+        self._table = resource.Table(self.table_name)
+
+    def load_all(self):
+        """
+            Fetch the filenames of every migration that has run with a single paginated scan
+            and cache them, so subsequent has_run() calls are answered locally. The scan goes
+            through the low-level client, reading the string values straight out of the raw
+            attribute maps instead of running every item through the resource deserializer.
+        """
+
+        self._get_table()
+        paginator = self._client.get_paginator('scan')
+        ran = set()
+        for page in paginator.paginate(TableName=self.table_name, ProjectionExpression='filename'):
+            ran.update(item['filename']['S'] for item in page['Items'])
+
+        self._ran = ran
+        return ran
 
     def has_run(self, filename):
+        if self._ran is not None:
+            return filename in self._ran
+
         table = self._get_table()
-        logging.info(f"Checking if {filename} has run")
+        logger.info("Checking if %s has run", filename)
         response = table.get_item(Key={'filename': filename})
 
         return 'Item' in response
 
     def get_last_n(self, n):
-        table = self._get_table()
-        response = table.scan()
-        items = sorted(response.get('Items', []), reverse=True, key=lambda x: x['filename'])
-        return [ item['filename'] for item in items[-n:] ]
+        """
+            Return the filenames of the n most recently timestamped migrations, newest first.
+        """
+
+        filenames = self._ran if self._ran is not None else self.load_all()
+        return heapq.nlargest(n, filenames, key=os.path.basename)
 
     def store(self, filename):
-        table = self._get_table()
-        logging.debug(f"Storing {filename}")
-        table.put_item(Item={'filename': filename})
+        logger.debug("Storing %s", filename)
+        if self._batch is not None:
+            self._batch.put_item(Item={'filename': filename})
+        else:
+            self._get_table().put_item(Item={'filename': filename})
+        if self._ran is not None:
+            self._ran.add(filename)
 
     def delete(self, filename):
-        table = self._get_table()
-        logging.debug(f"Deleting {filename}")
-        table.delete_item(Key={'filename': filename})
+        logger.debug("Deleting %s", filename)
+        if self._batch is not None:
+            self._batch.delete_item(Key={'filename': filename})
+        else:
+            self._get_table().delete_item(Key={'filename': filename})
+        if self._ran is not None:
+            self._ran.discard(filename)
 
 
 class MemoryStorageEngine:
@@ -78,71 +207,74 @@ class MemoryStorageEngine:
         A simple in-memory storage engine. Useful for testing, but has no persistence.
     """
 
-    data = {}
-
     def __init__(self, table_name):
         self.table_name = table_name
-        self.data = {}
+        self.data = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def prepare(self):
+        pass
+
+    def load_all(self):
+        return self.data
 
     def has_run(self, filename):
         return filename in self.data
 
     def store(self, filename):
-        logging.debug(f"Storing {filename}")
-        self.data[filename] = True
+        logger.debug("Storing %s", filename)
+        self.data.add(filename)
 
     def delete(self, filename):
-        logging.debug(f"Deleting {filename}")
-        del self.data[filename]
+        logger.debug("Deleting %s", filename)
+        self.data.discard(filename)
 
 
 class MigratorHelpers:
 
-    def _migrate_up(self, filename):
-        """
-            Load and run a single migration script.
-        """
-
-        script_path = os.path.join(self.directory, filename)
-        logging.debug(f'Migrating {script_path}')
-
-        script = self._load_script(script_path)
-        logging.debug(f'Returned {script}')
-        logging.debug(f'Running {script.filename}')
-
-        self.up(script)
-
     def _load_script(self, path):
         """
             Dynamically load a migration script given its file path. The name of the module
             is derived from the basename of the path to ensure uniqueness and readability.
+            Each path is only executed once; later calls return the cached module.
         """
 
-        logging.debug(f"Loading migration script from path: {path}")
+        cache_key = os.path.realpath(path)
+        cached = self._module_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        logger.debug("Loading migration script from path: %s", path)
 
         if not os.path.exists(path):
             raise FileNotFoundError(f"Migration script not found: {path}")
 
         # Extract a unique module name from the file path
         module_name = os.path.splitext(os.path.basename(path))[0].replace('-', '_').replace(' ', '_')
-        logging.debug(f"Module name: {module_name}")
+        logger.debug("Module name: %s", module_name)
 
         # build the module path from the directory provided as the base via self.directory.
         # eg/ if given the module to load is at /path/to/app_with_modules/module1/migrations/20240410093757_migration.py
         # the module path would be module1/migrations/20240410093757_migration
-        dependency_path = os.path.relpath(path, self.directory).replace('.py', '')
-        logging.debug(f"Dependency path: {dependency_path}")
+        dependency_path = os.path.relpath(path, self.directory).removesuffix('.py')
+        logger.debug("Dependency path: %s", dependency_path)
 
         try:
             spec = importlib.util.spec_from_file_location(module_name, path)
-            logging.debug(f"Loading module: {module_name}")
+            logger.debug("Loading module: %s", module_name)
             if spec and spec.loader:
                 module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                module.filename = path.replace('.py', '').replace(self.directory, '').strip('/')
+                exec(_get_code(spec), module.__dict__)
+                module.filename = dependency_path
                 module.dependency_path = dependency_path
-                logging.debug(f"Loaded module: {module_name}")
+                logger.debug("Loaded module: %s", module_name)
 
+                self._module_cache[cache_key] = module
                 return module
 
             raise Exception(f"Could not read module from path: {path}")
@@ -151,41 +283,121 @@ class MigratorHelpers:
 
     def _find_all_migration_files(self):
         """
-            Find and return a list of migration files within the directory.
+            Find and return the MigrationFiles within the directory, sorted by path.
         """
 
-        migration_files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if self._is_migration_file(f)]
+        with os.scandir(self.directory) as it:
+            entries = list(it)
+
+        migration_files = self._migration_files_in(entries)
 
         if not migration_files:
-            if os.path.exists(os.path.join(self.directory, 'migrations')):
+            if any(entry.name == 'migrations' and entry.is_dir() for entry in entries):
                 # Assume we need to look for migrations within a migrations folder
                 self.directory = os.path.join(self.directory, 'migrations')
-                migration_files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if self._is_migration_file(f)]
+                with os.scandir(self.directory) as it:
+                    migration_files = self._migration_files_in(it)
             else:
                 # Assume we need to look for migrations within modules
-                modules = self._find_modules_with_migrations()
+                modules = self._find_modules_with_migrations(entries)
                 for module_path in modules:
-                    migrations_path = os.path.join(module_path, 'migrations')
-                    migration_files += [os.path.join(migrations_path, f) for f in os.listdir(migrations_path) if self._is_migration_file(f)]
+                    with os.scandir(os.path.join(module_path, 'migrations')) as it:
+                        migration_files += self._migration_files_in(it)
 
         # Check if there are any duplicate migration file names. We need all names to be unique.
-        migration_names = {}
-        migration_timestamps = {}
-        for f in migration_files:
-            name = os.path.basename(f).replace('.py', '')
-            if name in migration_names:
-                raise ValueError(f"Duplicate migration file name used: {f}")
+        migration_names = set()
+        migration_timestamps = set()
+        for migration_file in migration_files:
+            if migration_file.name in migration_names:
+                raise ValueError(f"Duplicate migration file name used: {migration_file.path}")
 
             # check if the timestamp is unique
-            timestamp = name.split('_')[0]
+            timestamp = migration_file.name.split('_')[0]
             if timestamp in migration_timestamps:
-                raise ValueError(f"Duplicate migration timestamp used: {f}")
+                raise ValueError(f"Duplicate migration timestamp used: {migration_file.path}")
 
-            migration_timestamps[timestamp] = True
-            migration_names[name] = True
+            migration_timestamps.add(timestamp)
+            migration_names.add(migration_file.name)
 
+        migration_files.sort(key=lambda migration_file: migration_file.path)
         return migration_files
 
+    def _dependency_graph(self, scripts):
+        """
+            Build the dependency graph for the scripts and every dependency they reference.
+            Returns the scripts keyed by dependency path, and the set of dependency paths
+            each of them depends on. Dependencies that have already been run, or any outside
+            the given scripts when migrate_dependencies is off, are never loaded, so they
+            appear in the graph without a script. The dependencies of scripts that have
+            already been run are not followed.
+        """
+
+        nodes = {script.dependency_path: script for script in scripts}
+        dependencies = {}
+        queue = list(scripts)
+        while queue:
+            script = queue.pop()
+            dependencies[script.dependency_path] = set()
+            if self.storage_engine.has_run(script.dependency_path):
+                continue
+
+            for dependency in getattr(script, 'dependencies', []):
+                dependency_path = self._dependency_path_for(dependency)
+                dependencies[script.dependency_path].add(dependency_path)
+                if dependency_path in nodes or dependency_path in dependencies:
+                    continue
+
+                if self.storage_engine.has_run(dependency_path) or not self.migrate_dependencies:
+                    # Nothing to run: it has either run already or must not be run from here
+                    dependencies[dependency_path] = set()
+                    continue
+
+                dependency_script = self._load_script(self._resolve_dependency_path(dependency))
+                nodes[dependency_path] = dependency_script
+                queue.append(dependency_script)
+
+        return nodes, dependencies
+
+    def _topological_order(self, dependencies):
+        """
+            Order the dependency paths so every migration comes after its dependencies, breaking
+            ties by path so independent migrations keep their timestamp order. Also returns the
+            depth of each path, one more than that of its deepest dependency.
+        """
+
+        in_degree = {path: len(deps) for path, deps in dependencies.items()}
+        dependents = defaultdict(list)
+        for path, deps in dependencies.items():
+            for dependency_path in deps:
+                dependents[dependency_path].append(path)
+
+        ready = [path for path, degree in in_degree.items() if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        depth = {}
+        while ready:
+            path = heapq.heappop(ready)
+            depth[path] = max((depth[dependency_path] + 1 for dependency_path in dependencies[path]), default=0)
+            order.append(path)
+            for dependent in dependents[path]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+
+        if len(order) != len(dependencies):
+            cyclic = sorted(path for path, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"Circular migration dependency detected between: {', '.join(cyclic)}")
+
+        return order, depth
+
+    def _dependency_path_for(self, dependency):
+        """
+            Return the dependency path a dependency's script will have once loaded, without
+            loading it.
+        """
+
+        return os.path.relpath(self._resolve_dependency_path(dependency), self.directory).removesuffix('.py')
+
     def _resolve_dependency_path(self, dependency):
         """
             Resolve the full path of a dependency script, assuming a format of
@@ -207,18 +419,28 @@ class MigratorHelpers:
             Check if a filename matches the expected migration file pattern.
         """
 
-        return re.match(r'\d{14}_.*\.py$', filename) is not None
+        return _MIGRATION_RE.match(filename) is not None
 
-    def _find_modules_with_migrations(self):
+    def _migration_files_in(self, entries):
         """
-            Find and return a list of paths to modules that contain a migrations folder.
+            Return a MigrationFile for each migration file among the given directory entries.
+        """
+
+        return [
+            MigrationFile(name=os.path.splitext(entry.name)[0], path=entry.path)
+            for entry in entries if self._is_migration_file(entry.name) and entry.is_file()
+        ]
+
+    def _find_modules_with_migrations(self, entries):
+        """
+            Find and return a list of paths to modules, among the given directory entries,
+            that contain a migrations folder.
         """
 
         modules = []
-        for item in os.listdir(self.directory):
-            module_path = os.path.join(self.directory, item)
-            if os.path.isdir(module_path) and os.path.exists(os.path.join(module_path, 'migrations')):
-                modules.append(module_path)
+        for entry in entries:
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, 'migrations')):
+                modules.append(entry.path)
 
         return modules
 
@@ -241,40 +463,32 @@ class Migrator(MigratorHelpers):
             ```
     """
 
-    def __init__(self, directory, storage_engine, dry_run=False, migrate_dependencies=True):
+    def __init__(self, directory, storage_engine, dry_run=False, migrate_dependencies=True, workers=1):
         self.directory = directory
         self.storage_engine = storage_engine
         self.dry_run = dry_run
         self.migrate_dependencies = migrate_dependencies
+        self.workers = workers
+        self._module_cache = {}
 
     def up(self, script):
         """
-            Run the migration script's up() method if its dependencies are satisfied.
+            Run the migration script's up() method if its dependencies are satisfied. With
+            migrate_dependencies, dependencies that have not been run are run first, in
+            dependency order and each at most once.
         """
 
         if self.storage_engine.has_run(script.filename):
-            logging.debug(f'{script.filename} has already been run')
+            logger.debug('%s has already been run', script.filename)
             return
 
-        # Handle script dependencies
-        if hasattr(script, 'dependencies'):
-            for dependency in script.dependencies:
-                dependency_path = self._resolve_dependency_path(dependency)
-                dependency_script = self._load_script(dependency_path)
-                if not self.storage_engine.has_run(dependency_script.dependency_path):
-                    if not self.migrate_dependencies:
-                        logging.error(f'{script.filename} has not been run because {dependency_script.dependency_path} has not been run')
-                        return
-                    else:
-                        dependency_script = self._load_script(dependency_path)
-                        self.up(dependency_script)
-
-        if not self.dry_run:
-            logging.info(f'Running up() on {script.filename}')
-            script.up()
-            self.storage_engine.store(script.dependency_path)
+        nodes, dependencies = self._dependency_graph([script])
+        if self.migrate_dependencies:
+            order, _ = self._topological_order(dependencies)
         else:
-            logging.debug(f'Would run {script.filename}')
+            order = [script.dependency_path]
+
+        self._migrate_paths(order, nodes, dependencies, set())
 
     def down(self, script):
         """
@@ -282,59 +496,127 @@ class Migrator(MigratorHelpers):
         """
 
         if not self.storage_engine.has_run(script.filename):
-            logging.debug(f'{script.filename} has not been run')
+            logger.debug('%s has not been run', script.filename)
             return
 
         if not self.dry_run:
-            logging.info(f'Running down() on {script.filename}')
+            logger.info('Running down() on %s', script.filename)
             script.down()
             self.storage_engine.delete(script.dependency_path)
         else:
-            logging.debug(f'Would rollback {script.filename}')
+            logger.debug('Would rollback %s', script.filename)
 
     def migrate(self):
         """
             Dynamically determine if it should scan for migration files directly within the
-            given directory or look for migrations folders within modules.
+            given directory or look for migrations folders within modules, then run them in
+            dependency order. Each script is loaded and checked exactly once.
         """
 
-        migration_files = self._find_all_migration_files()
-        for full_path in sorted(migration_files):
-            self._migrate_up(full_path)
+        self.storage_engine.prepare()
+        scripts = [self._load_script(migration_file.path) for migration_file in self._find_all_migration_files()]
+        self.storage_engine.load_all()
+        nodes, dependencies = self._dependency_graph(scripts)
+        order, depth = self._topological_order(dependencies)
+        if not self.migrate_dependencies:
+            # Only run migrations found in the directory; dependents of anything else that
+            # has not been run are skipped
+            found = {script.dependency_path for script in scripts}
+            order = [path for path in order if path in found]
+
+        # Each migration is stored as soon as its up() succeeds rather than batched, so a
+        # killed run never forgets migrations that have already been applied
+        planned = set()
+        if self.workers > 1:
+            layers = defaultdict(list)
+            for path in order:
+                layers[depth[path]].append(path)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for level in sorted(layers):
+                    self._migrate_paths(layers[level], nodes, dependencies, planned, executor)
+        else:
+            self._migrate_paths(order, nodes, dependencies, planned)
+
+    def _migrate_paths(self, paths, nodes, dependencies, planned, executor=None):
+        """
+            Run up() for each path that has not been run and whose dependencies have. Given an
+            executor, the paths must be independent of each other: their up() calls run in
+            worker threads, while state is still checked and stored on this thread.
+        """
+
+        def satisfied(path):
+            return path in planned or self.storage_engine.has_run(path)
+
+        pending = []
+        for path in paths:
+            if satisfied(path):
+                logger.debug('%s has already been run', path)
+                continue
+
+            script = nodes[path]
+
+            missing = sorted(dependency_path for dependency_path in dependencies[path] if not satisfied(dependency_path))
+            if missing:
+                logger.error('%s has not been run because %s has not been run', script.filename, missing[0])
+                continue
+
+            if self.dry_run:
+                logger.debug('Would run %s', script.filename)
+                planned.add(path)
+            elif executor is None:
+                logger.info('Running up() on %s', script.filename)
+                script.up()
+                self.storage_engine.store(path)
+            else:
+                logger.info('Running up() on %s', script.filename)
+                pending.append((path, executor.submit(script.up)))
+
+        error = None
+        for path, future in pending:
+            if future.exception() is None:
+                self.storage_engine.store(path)
+            elif error is None:
+                error = future.exception()
+
+        if error is not None:
+            raise error
 
     def rollback(self, n):
         """
             Rollback the last n migrations.
         """
 
+        self.storage_engine.prepare()
         migration_files = self._find_all_migration_files()
-        migrations_map = {os.path.basename(f).replace('.py', ''): f for f in migration_files}
+        self.storage_engine.load_all()
+        migrations_map = {migration_file.name: migration_file.path for migration_file in migration_files}
         migration_files = self.storage_engine.get_last_n(n)
 
         count = 0
-        for file in migration_files:
-            file = os.path.basename(file).replace('.py', '')
-            script = self._load_script(migrations_map[file])
-            self.down(script)
+        with self.storage_engine:
+            for file in migration_files:
+                script = self._load_script(migrations_map[os.path.basename(file)])
+                self.down(script)
 
-            count += 1
-            if count == n:
-                break
+                count += 1
+                if count == n:
+                    break
 
     def status(self):
         """
             Print the status of the migrations.
         """
 
-        files = sorted(os.listdir(self.directory))
+        self.storage_engine.prepare()
+        scripts = [self._load_script(migration_file.path) for migration_file in self._find_all_migration_files()]
+        self.storage_engine.load_all()
 
-        for file in files:
-            if file.endswith('.py'):
-                script = self._load_script(os.path.join(self.directory, file))
-                if self.storage_engine.has_run(script.filename):
-                    print(f'{script.filename} has been run')
-                else:
-                    print(f'{script.filename} has not been run')
+        for script in scripts:
+            if self.storage_engine.has_run(script.filename):
+                print(f'{script.filename} has been run')
+            else:
+                print(f'{script.filename} has not been run')
 
     def make_empty(self):
         """
@@ -344,9 +626,10 @@ class Migrator(MigratorHelpers):
         filename = time.strftime('%Y%m%d%H%M%S') + '_migration.py'
 
         # get the filename of the previous file to add it as a dependency
-        files = sorted(os.listdir(self.directory), reverse=True)
+        with os.scandir(self.directory) as it:
+            previous = max((entry.name for entry in it if self._is_migration_file(entry.name)), default=None)
 
-        dependency_filename = f"'{files[0].replace('.py', '')}'" if files else ''
+        dependency_filename = f"'{previous.removesuffix('.py')}'" if previous else ''
         with open(os.path.join(self.directory, filename), 'w') as f:
             f.write(f"""
 dependencies = [
@@ -365,6 +648,11 @@ def down():
 
 
 def main():
+    logging.basicConfig(level=logging.DEBUG, format=log_format)
+    logging.getLogger('botocore').setLevel(logging.CRITICAL + 1)
+    logging.getLogger('boto3').setLevel(logging.CRITICAL + 1)
+    logging.getLogger('urllib3').setLevel(logging.CRITICAL + 1)
+
     parser = argparse.ArgumentParser(description='Migration script')
     parser.add_argument('--engine', default='dynamodb', help='Storage engine')
     parser.add_argument('--dynamodb-endpoint-url', default=None, help='DynamoDB endpoint URL')
@@ -373,6 +661,7 @@ def main():
     parser.add_argument('--file', default=None, help='Migration file to run. Takes precidence over directory.')
     parser.add_argument('--dry-run', action='store_true', help='Dry run')
     parser.add_argument('--migrate-dependencies', action='store_true', help='Auto-migrate dependencies')
+    parser.add_argument('--workers', type=int, default=1, help='Number of independent migrations to run concurrently')
     parser.add_argument('command', choices=['up', 'down', 'rollback', 'status', 'make'], help='Command')
     parser.add_argument('n', type=int, nargs='?', default=0, help='Number of migrations to rollback')
 
@@ -397,7 +686,8 @@ def main():
         args.directory,
         storage_engine,
         dry_run=args.dry_run,
-        migrate_dependencies=args.migrate_dependencies
+        migrate_dependencies=args.migrate_dependencies,
+        workers=args.workers
     )
 
     if args.command == 'up':
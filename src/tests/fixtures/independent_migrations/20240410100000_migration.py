@@ -0,0 +1,11 @@
+# Path: migrations/20240410100000_migration.py
+dependencies = [
+    # List of dependencies
+
+]
+
+def up():
+    print(f"Hello, running up() from migration 20240410100000")
+
+def down():
+    print(f"Hello, running down() from migration 20240410100000")
\ No newline at end of file
@@ -0,0 +1,12 @@
+# Path: migrations/20240410100002_migration.py
+dependencies = [
+    # List of dependencies
+    '20240410100000_migration',
+    '20240410100001_migration'
+]
+
+def up():
+    print(f"Hello, running up() from migration 20240410100002")
+
+def down():
+    print(f"Hello, running down() from migration 20240410100002")
\ No newline at end of file
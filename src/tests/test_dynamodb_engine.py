@@ -64,3 +64,53 @@ def test_migration_scenarios(migration_setup, request, dynamodb):
         assert "Hello, running up() from migration 20240410094004" in captured_output.getvalue()
         assert "Hello, running up() from migration 20240410094006" in captured_output.getvalue()
 
+
+
+def test_creates_missing_table(aws_credentials):
+    with mock_aws():
+        storage_engine = DynamoDBStorageEngine('missing_migrations')
+        storage_engine.store('20240410094004_migration')
+
+        assert storage_engine.has_run('20240410094004_migration')
+        assert 'missing_migrations' in boto3.client('dynamodb').list_tables()['TableNames']
+
+
+def test_load_all_prefetches_run_migrations(dynamodb):
+    dynamodb.Table('test_migrations').put_item(Item={'filename': '20240410094004_migration'})
+
+    storage_engine = DynamoDBStorageEngine('test_migrations')
+    assert storage_engine.load_all() == {'20240410094004_migration'}
+
+    storage_engine.store('20240410094006_migration')
+    assert storage_engine.has_run('20240410094006_migration')
+
+    storage_engine.delete('20240410094004_migration')
+    assert not storage_engine.has_run('20240410094004_migration')
+
+
+def test_batched_writes_are_flushed_on_exit(dynamodb):
+    storage_engine = DynamoDBStorageEngine('test_migrations')
+    with storage_engine:
+        storage_engine.store('20240410094004_migration')
+        storage_engine.store('20240410094006_migration')
+
+    items = dynamodb.Table('test_migrations').scan()['Items']
+    assert sorted(item['filename'] for item in items) == ['20240410094004_migration', '20240410094006_migration']
+
+
+def test_get_last_n_returns_newest_first(dynamodb):
+    table = dynamodb.Table('test_migrations')
+    for filename in ['module2/migrations/20240410093809_migration', 'module1/migrations/20240410093757_migration', '20240410094006_migration']:
+        table.put_item(Item={'filename': filename})
+
+    storage_engine = DynamoDBStorageEngine('test_migrations')
+    assert storage_engine.get_last_n(2) == ['20240410094006_migration', 'module2/migrations/20240410093809_migration']
+
+
+def test_prepare_creates_table_in_background(aws_credentials):
+    with mock_aws():
+        storage_engine = DynamoDBStorageEngine('missing_migrations')
+        storage_engine.prepare()
+
+        assert not storage_engine.has_run('20240410094004_migration')
+        assert 'missing_migrations' in boto3.client('dynamodb').list_tables()['TableNames']
@@ -34,3 +34,143 @@ def test_memory_storage_engine(migration_setup, request):
         assert "Hello, running up() from migration 20240410094004" in captured_output.getvalue()
         assert "Hello, running up() from migration 20240410094006" in captured_output.getvalue()
 
+
+
+def test_load_script_is_cached():
+    directory_path = str(Path(__file__).resolve().parent / "fixtures" / "migrations_directory")
+    migrator = Migrator(directory=directory_path, storage_engine=MemoryStorageEngine('test_migrations'))
+    script_path = os.path.join(directory_path, '20240410094004_migration.py')
+
+    assert migrator._load_script(script_path) is migrator._load_script(script_path)
+
+
+def test_concurrent_migrations(migration_setup):
+    captured_output = StringIO()
+    sys.stdout = captured_output
+
+    storage_engine = MemoryStorageEngine('test_migrations')
+    migrator = Migrator(directory=str(migration_setup), storage_engine=storage_engine, workers=4)
+    migrator.migrate()
+
+    sys.stdout = sys.__stdout__
+
+    assert len(storage_engine.data) == 2
+    assert captured_output.getvalue().count("Hello, running up()") == 2
+
+
+def test_status(migration_setup):
+    captured_output = StringIO()
+    sys.stdout = captured_output
+
+    migrator = Migrator(directory=str(migration_setup), storage_engine=MemoryStorageEngine('test_migrations'))
+    migrator.status()
+
+    sys.stdout = sys.__stdout__
+
+    assert captured_output.getvalue().count("has not been run") == 2
+
+
+def test_circular_dependencies_are_rejected(tmp_path):
+    (tmp_path / '20240410094004_migration.py').write_text("dependencies = ['20240410094006_migration']\n\ndef up():\n    pass\n")
+    (tmp_path / '20240410094006_migration.py').write_text("dependencies = ['20240410094004_migration']\n\ndef up():\n    pass\n")
+
+    migrator = Migrator(directory=str(tmp_path), storage_engine=MemoryStorageEngine('test_migrations'))
+    with pytest.raises(ValueError, match='Circular migration dependency'):
+        migrator.migrate()
+
+
+def test_make_empty_depends_on_latest_migration(tmp_path):
+    shutil.copytree(Path(__file__).resolve().parent / "fixtures" / "basic_app" / "migrations", tmp_path / "migrations")
+    directory_path = str(tmp_path / "migrations")
+
+    migrator = Migrator(directory=directory_path, storage_engine=MemoryStorageEngine('test_migrations'))
+    migrator.make_empty()
+
+    created = max(f for f in os.listdir(directory_path) if f[0].isdigit())
+    with open(os.path.join(directory_path, created)) as f:
+        assert "'20240410094006_migration'" in f.read()
+
+
+def test_up_runs_dependencies_first():
+    captured_output = StringIO()
+    sys.stdout = captured_output
+
+    directory_path = str(Path(__file__).resolve().parent / "fixtures" / "migrations_directory")
+    storage_engine = MemoryStorageEngine('test_migrations')
+    migrator = Migrator(directory=directory_path, storage_engine=storage_engine)
+    migrator.up(migrator._load_script(os.path.join(directory_path, '20240410094006_migration.py')))
+
+    sys.stdout = sys.__stdout__
+
+    output = captured_output.getvalue()
+    assert output.index("migration 20240410094004") < output.index("migration 20240410094006")
+    assert storage_engine.data == {'20240410094004_migration', '20240410094006_migration'}
+
+
+def test_run_dependencies_are_not_loaded():
+    directory_path = str(Path(__file__).resolve().parent / "fixtures" / "migrations_directory")
+    storage_engine = MemoryStorageEngine('test_migrations')
+    storage_engine.store('20240410094004_migration')
+    migrator = Migrator(directory=directory_path, storage_engine=storage_engine)
+    migrator.up(migrator._load_script(os.path.join(directory_path, '20240410094006_migration.py')))
+
+    assert storage_engine.has_run('20240410094006_migration')
+    assert os.path.realpath(os.path.join(directory_path, '20240410094004_migration.py')) not in migrator._module_cache
+
+
+def test_dependencies_of_run_migrations_are_ignored(tmp_path):
+    (tmp_path / 'other').mkdir()
+    (tmp_path / 'other' / '20240410090000_migration.py').write_text("def up():\n    print('UP 20240410090000')\n")
+    (tmp_path / '20240410094004_migration.py').write_text("dependencies = ['other/20240410090000_migration']\n\ndef up():\n    pass\n")
+
+    captured_output = StringIO()
+    sys.stdout = captured_output
+
+    storage_engine = MemoryStorageEngine('test_migrations')
+    storage_engine.store('20240410094004_migration')
+    migrator = Migrator(directory=str(tmp_path), storage_engine=storage_engine)
+    migrator.migrate()
+
+    sys.stdout = sys.__stdout__
+
+    assert not storage_engine.has_run('other/20240410090000_migration')
+    assert 'UP 20240410090000' not in captured_output.getvalue()
+
+
+def test_concurrent_migrations_run_dependents_last():
+    captured_output = StringIO()
+    sys.stdout = captured_output
+
+    directory_path = str(Path(__file__).resolve().parent / "fixtures" / "independent_migrations")
+    storage_engine = MemoryStorageEngine('test_migrations')
+    migrator = Migrator(directory=directory_path, storage_engine=storage_engine, workers=4)
+    migrator.migrate()
+
+    sys.stdout = sys.__stdout__
+
+    lines = [line for line in captured_output.getvalue().splitlines() if line.startswith("Hello, running up()")]
+    assert len(lines) == 3
+    assert lines[-1] == "Hello, running up() from migration 20240410100002"
+    assert storage_engine.data == {'20240410100000_migration', '20240410100001_migration', '20240410100002_migration'}
+
+
+def test_concurrent_migration_failure_keeps_successful_peers(tmp_path):
+    (tmp_path / '20240410100000_migration.py').write_text("def up():\n    raise RuntimeError('boom')\n")
+    (tmp_path / '20240410100001_migration.py').write_text("def up():\n    pass\n")
+
+    storage_engine = MemoryStorageEngine('test_migrations')
+    migrator = Migrator(directory=str(tmp_path), storage_engine=storage_engine, workers=2)
+    with pytest.raises(RuntimeError, match='boom'):
+        migrator.migrate()
+
+    assert storage_engine.data == {'20240410100001_migration'}
+
+
+def test_unrun_dependencies_are_not_loaded_without_migrate_dependencies():
+    directory_path = str(Path(__file__).resolve().parent / "fixtures" / "migrations_directory")
+    storage_engine = MemoryStorageEngine('test_migrations')
+    migrator = Migrator(directory=directory_path, storage_engine=storage_engine, migrate_dependencies=False)
+    migrator.up(migrator._load_script(os.path.join(directory_path, '20240410094006_migration.py')))
+
+    assert not storage_engine.data
+    assert os.path.realpath(os.path.join(directory_path, '20240410094004_migration.py')) not in migrator._module_cache